@@ -3,10 +3,12 @@ import sys
 import traceback
 import asyncio
 import re
-import json
 import zipfile
 import shutil
+import tempfile
 import time
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Tuple, List, Dict, Optional, Any
 import logging
@@ -14,22 +16,56 @@ import winreg
 
 # 延迟导入依赖库
 try:
-    import aiofiles
     import httpx
     import vdf
 except ImportError as e:
-    raise ImportError(f"缺少依赖库: {e}. 请使用 'pip install aiofiles httpx vdf' 安装。")
+    raise ImportError(f"缺少依赖库: {e}. 请使用 'pip install httpx vdf' 安装。")
 
 # 从 backend 包导入
-from .io import get_app_dir, DEFAULT_CONFIG
+from .io import get_app_dir, DEFAULT_CONFIG, json_loads, json_dumps
 from .stconverter import STConverter
 from .github import GithubClient
 
 app_dir = get_app_dir()
 
+# 模块级预编译正则，避免在逐文件循环中重复编译
+_MANIFEST_RE = re.compile(r'(\d+)_(\w+)\.manifest')
+# 字节级合并正则：一趟同时匹配两种addappid写法（带不带"1,"参数），省去UTF-8解码
+_ADDAPPID_BYTES_RE = re.compile(rb'addappid\((\d+),\s*(?:1,\s*)?"([^"]+)"\)')
+
+# Steam商店搜索的固定请求头与地区语言映射，模块级常量避免每次搜索重建。
+# URL预先解析成httpx.URL，每次请求免去重复的URL解析
+_STEAM_SEARCH_URL = httpx.URL('https://store.steampowered.com/api/storesearch/')
+_STEAM_SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36',
+    'Accept': 'application/json',
+    # 显式声明压缩编码，减少传输字节数（httpx会自动解压）
+    'Accept-Encoding': 'gzip, deflate',
+}
+_STEAM_LANGUAGE_MAP = {
+    'CN': 'schinese',
+    'US': 'english',
+}
+# 分阶段超时：连接不上快速失败，读取阶段才给足时间
+_STEAM_SEARCH_TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=3.0, pool=2.0)
+# 驻留常见的type默认值，所有结果字典共享同一个字符串对象
+_GAME = sys.intern('Game')
+
 class GuiBackend:
     """GUI后端处理类"""
-    
+
+    # 并发处理AppID的上限，避免对GitHub/镜像源发起过多请求
+    MAX_CONCURRENT_APPS = 8
+
+    # 单个仓库内并发下载文件数的上限，防止大清单树一次打开数百个连接
+    MAX_CONCURRENT_FILES = 16
+
+    # 游戏搜索结果缓存的有效期（秒），命中时免去HTTP往返和JSON解析
+    SEARCH_CACHE_TTL = 300.0
+
+    # 搜索缓存的条目上限，超出时按插入顺序淘汰最旧的
+    SEARCH_CACHE_MAX = 512
+
     def __init__(self, logger: logging.Logger):
         self.log = logger
         self.st_converter = STConverter(self.log)
@@ -40,6 +76,25 @@ class GuiBackend:
         self.unlocker_type: Optional[str] = None
         self.temp_dir = app_dir / 'temp_cai_install'
         self.st_lock_manifest_version = False
+        # 检测结果缓存：注册表/文件系统探测只做一次，设置变更时手动失效
+        self._steam_path_cache: Optional[Path] = None
+        self._unlocker_cache: Optional[str] = None
+        # config.vdf 的内存缓存：一次解析、逐AppID合并、流程结束统一写回
+        self._config_vdf_cache: Optional[Dict[str, Any]] = None
+        self._config_vdf_dirty = False
+        self._config_vdf_lock: Optional[asyncio.Lock] = None
+        self._config_vdf_lock_loop = None
+        # 本会话内已确认存在的固定目录，避免重复mkdir逐级stat
+        self._created_dirs: set = set()
+        # config.json 的解析缓存：(mtime_ns, 解析结果)，文件未变时免去重读重解析
+        self._config_file_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # 游戏搜索结果缓存：规范化关键词 -> (时间戳, 结果列表)
+        self._search_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # 限制同时在途的搜索请求数，突发搜索时避免触发Steam限流。
+        # 用Condition+计数器而非Semaphore，便于运行时安全调整上限
+        self._search_cond = asyncio.Condition()
+        self._search_in_flight = 0
+        self._search_max = 8
     
     def stack_error(self, e: Exception) -> str:
         """获取完整的异常堆栈信息"""
@@ -82,9 +137,9 @@ class GuiBackend:
         """委托给 github_client（从输入中提取AppID）"""
         return self.github_client.extract_app_id(user_input)
     
-    async def resolve_appids(self, inputs: List[str]) -> List[str]:
+    def resolve_appids(self, inputs: List[str]) -> List[str]:
         """委托给 github_client（解析多个AppID）"""
-        return await self.github_client.resolve_appids(inputs)
+        return self.github_client.resolve_appids(inputs)
     
     async def search_all_repos(self, client: httpx.AsyncClient, app_id: str, repos: List[str]) -> List[Dict[str, Any]]:
         """委托给 github_client（在所有仓库中搜索）"""
@@ -113,19 +168,25 @@ class GuiBackend:
         if not config_path.exists():
             self.gen_config_file()
             return
-        
+
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                loaded_config = json.load(f)
-            
+            # 文件未被修改时直接复用上次的解析结果
+            mtime_ns = config_path.stat().st_mtime_ns
+            if self._config_file_cache is not None and self._config_file_cache[0] == mtime_ns:
+                self.app_config = self._config_file_cache[1]
+                return
+
+            loaded_config = json_loads(config_path.read_bytes())
+
             # 验证配置完整性
             for key, value in DEFAULT_CONFIG.items():
                 if key not in loaded_config:
                     loaded_config[key] = value
-            
+
             self.app_config = loaded_config
-            
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._config_file_cache = (mtime_ns, loaded_config)
+
+        except ValueError as e:
             self.log.error(f"配置文件格式错误，将重置: {e}")
             config_path.unlink(missing_ok=True)
             self.gen_config_file()
@@ -141,8 +202,8 @@ class GuiBackend:
         try:
             self.log.info(f"生成配置文件: {config_path}")
 
-            with open(config_path, mode="w", encoding="utf-8") as f:
-                json.dump(DEFAULT_CONFIG, f, indent=2, ensure_ascii=False)
+            config_path.write_text(json_dumps(DEFAULT_CONFIG), encoding="utf-8")
+            self._config_file_cache = None
 
             self.app_config = DEFAULT_CONFIG.copy()
             self.log.info('配置文件已生成，请在"设置"中填写。')
@@ -158,15 +219,19 @@ class GuiBackend:
         try:
             config_path = app_dir / "config.json"
             self.log.info(f"保存配置文件: {config_path}")
-            
-            # 创建备份
-            if config_path.exists():
-                backup_path = config_path.with_suffix('.json.bak')
-                shutil.copy2(config_path, backup_path)
-            
-            with open(config_path, mode="w", encoding="utf-8") as f:
-                json.dump(self.app_config, f, indent=2, ensure_ascii=False)
-            
+
+            # 内容没变就不写盘
+            new_bytes = json_dumps(self.app_config).encode('utf-8')
+            if config_path.exists() and config_path.read_bytes() == new_bytes:
+                self.log.info('配置无变化，跳过写入。')
+                return True
+
+            # 先写临时文件再原子替换，崩溃也不会留下半截配置，无需.bak备份
+            tmp_path = config_path.with_suffix('.json.tmp')
+            tmp_path.write_bytes(new_bytes)
+            os.replace(tmp_path, config_path)
+            self._config_file_cache = None
+
             self.log.info('配置文件保存成功。')
             return True
             
@@ -175,16 +240,38 @@ class GuiBackend:
             self.log.error(f'保存配置失败: {config_path}, 错误={self.stack_error(e)}')
             return False
     
+    def _ensure_dir(self, path: Path) -> Path:
+        """确保目录存在；同一路径本会话内只做一次mkdir"""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+        return path
+
+    def invalidate_detection(self) -> None:
+        """清空路径/解锁工具检测缓存（设置变更后调用，下次访问重新探测）"""
+        self._steam_path_cache = None
+        self._unlocker_cache = None
+        # Steam路径可能已变化，目录存在性记录一并失效
+        self._created_dirs.clear()
+
     def detect_steam_path(self) -> Path:
-        """检测Steam安装路径"""
+        """检测Steam安装路径（成功结果会被缓存）"""
+        if self._steam_path_cache is not None:
+            self.steam_path = self._steam_path_cache
+            return self.steam_path
+
+        # Steam路径可能变化，重新检测时丢弃旧的config.vdf缓存
+        self._config_vdf_cache = None
+        self._config_vdf_dirty = False
         try:
             custom_path = self.app_config.get("Custom_Steam_Path", "").strip()
-            
+
             # 优先使用自定义路径
             if custom_path:
                 custom_path_obj = Path(custom_path)
                 if custom_path_obj.exists():
                     self.steam_path = custom_path_obj.resolve()
+                    self._steam_path_cache = self.steam_path
                     self.log.info(f"使用自定义Steam路径: {self.steam_path}")
                     return self.steam_path
                 else:
@@ -194,6 +281,7 @@ class GuiBackend:
                 key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Valve\Steam')
                 steam_path_str = winreg.QueryValueEx(key, 'SteamPath')[0]
                 self.steam_path = Path(steam_path_str).resolve()
+                self._steam_path_cache = self.steam_path
                 self.log.info(f"自动检测到Steam路径: {self.steam_path}")
                 return self.steam_path
             except (OSError, FileNotFoundError) as e:
@@ -209,6 +297,7 @@ class GuiBackend:
             for path in common_paths:
                 if path.exists():
                     self.steam_path = path.resolve()
+                    self._steam_path_cache = self.steam_path
                     self.log.info(f"找到Steam路径: {self.steam_path}")
                     return self.steam_path
             
@@ -222,28 +311,38 @@ class GuiBackend:
             return self.steam_path
     
     def detect_unlocker(self) -> str:
-        """检测解锁工具类型"""
+        """检测解锁工具类型（成功识别的结果会被缓存）"""
+        if self._unlocker_cache is not None:
+            self.unlocker_type = self._unlocker_cache
+            return self._unlocker_cache
+
         if not self.steam_path.exists():
             return "none"
-        
+
         # 检测SteamTools
         steamtools_dir = self.steam_path / 'config' / 'stplug-in'
         is_steamtools = steamtools_dir.is_dir()
-        
-        # 检测GreenLuma
-        greenluma_dlls = ['GreenLuma_2025_x86.dll', 'GreenLuma_2025_x64.dll']
-        is_greenluma = any((self.steam_path / dll).exists() for dll in greenluma_dlls)
-        
+
+        # 检测GreenLuma：一次listdir代替逐个DLL的exists探测
+        greenluma_dlls = {'GreenLuma_2025_x86.dll', 'GreenLuma_2025_x64.dll'}
+        try:
+            steam_files = set(os.listdir(self.steam_path))
+        except OSError:
+            steam_files = set()
+        is_greenluma = bool(greenluma_dlls & steam_files)
+
         if is_steamtools and is_greenluma:
             self.log.error("环境冲突：同时检测到SteamTools和GreenLuma！")
             return "conflict"
         elif is_steamtools:
             self.log.info("检测到解锁工具: SteamTools")
             self.unlocker_type = "steamtools"
+            self._unlocker_cache = "steamtools"
             return "steamtools"
         elif is_greenluma:
             self.log.info("检测到解锁工具: GreenLuma")
             self.unlocker_type = "greenluma"
+            self._unlocker_cache = "greenluma"
             return "greenluma"
         else:
             self.log.warning("未能自动检测到解锁工具。")
@@ -289,27 +388,40 @@ class GuiBackend:
                 self.log.error(f'仓库中没有找到清单文件: {app_id}')
                 return False
             
-            # 并行下载和处理文件
-            tasks = []
-            for item in tree:
-                tasks.append(
-                    self.get_manifest_from_github(client, sha, item['path'], repo, app_id, all_manifests)
-                )
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # 只为会被实际处理的文件建任务：其余文件下载后也会被丢弃，
+            # ST自动更新模式下清单文件本身也无需下载
+            is_st_auto_update_mode = self.is_steamtools() and self.app_config.get("steamtools_only_lua", False)
+            wanted_items = [
+                item for item in tree
+                if (item['path'].endswith('.manifest') and not is_st_auto_update_mode)
+                or 'key.vdf' in item['path'].lower()
+            ]
+            if is_st_auto_update_mode and len(wanted_items) < len(tree):
+                self.log.info(f'ST自动更新模式: 已跳过 {len(all_manifests)} 个清单文件下载')
+
+            # 并行下载和处理文件，信号量限制同时在途的请求数
+            sem = asyncio.Semaphore(self.MAX_CONCURRENT_FILES)
+
+            async def fetch_one(item):
+                async with sem:
+                    return await self.get_manifest_from_github(
+                        client, sha, item['path'], repo, app_id, all_manifests)
+
+            results = await asyncio.gather(
+                *(fetch_one(item) for item in wanted_items), return_exceptions=True)
             
             collected_depots = []
             for res in results:
                 # 如果是异常，记录错误并继续
                 if isinstance(res, Exception):
-                    self.log.error(f"下载/处理文件时出错: {res}")
+                    self.log.error("下载/处理文件时出错: %s", res)
                     continue
                 
                 # 确保 res 是列表类型（来自 get_manifest_from_github 的返回值）
                 if isinstance(res, list):
                     collected_depots.extend(res)
                 elif res:  # 如果 res 不是列表也不是None，可能有问题
-                    self.log.warning(f"忽略非列表类型的返回结果: {type(res)}")
+                    self.log.warning("忽略非列表类型的返回结果: %s", type(res))
             
             if not collected_depots:
                 self.log.error(f'未能收集到任何密钥信息: {app_id}')
@@ -357,13 +469,15 @@ class GuiBackend:
             depot_cache = self.steam_path / 'depotcache'
             cfg_depot_cache = self.steam_path / 'config' / 'depotcache'
             
-            for p in [depot_cache, cfg_depot_cache, stplug]:
-                p.mkdir(parents=True, exist_ok=True)
-            
-            for p in [depot_cache, cfg_depot_cache]:
-                manifest_path = p / Path(path).name
-                manifest_path.write_bytes(content)
+            for p in (depot_cache, cfg_depot_cache, stplug):
+                self._ensure_dir(p)
             
+            # 只写一份，第二个位置用硬链接镜像，省一半写盘带宽
+            manifest_name = Path(path).name
+            primary_path = depot_cache / manifest_name
+            primary_path.write_bytes(content)
+            self._dup_file(primary_path, cfg_depot_cache / manifest_name)
+
             self.log.info(f'清单已保存: {path}')
         
         # 处理密钥文件
@@ -378,19 +492,9 @@ class GuiBackend:
                     lua_path = stplug / f"{app_id}.lua"
                     is_floating_version = is_st_auto_update_mode and not self.st_lock_manifest_version
                     
-                    with open(lua_path, "w", encoding="utf-8") as f:
-                        f.write(f'addappid({app_id}, 1, "None")\n')
-                        for depot_id, key in depots:
-                            f.write(f'addappid({depot_id}, 1, "{key}")\n')
-                        
-                        for mf_path in all_manifests:
-                            if m := re.search(r'(\d+)_(\w+)\.manifest', mf_path):
-                                line = f'setManifestid({m.group(1)}, "{m.group(2)}")\n'
-                                if is_floating_version:
-                                    f.write('--' + line)
-                                else:
-                                    f.write(line)
-                    
+                    script = self._build_lua_script(app_id, depots, all_manifests, is_floating_version)
+                    lua_path.write_text(script, encoding="utf-8")
+
                     self.log.info(f'Lua脚本创建成功: {lua_path}')
                     
             except (UnicodeDecodeError, KeyError) as e:
@@ -398,144 +502,266 @@ class GuiBackend:
         
         return depots
     
+    def _get_config_vdf_lock(self) -> asyncio.Lock:
+        """获取绑定到当前事件循环的config.vdf缓存锁"""
+        loop = asyncio.get_running_loop()
+        if self._config_vdf_lock is None or self._config_vdf_lock_loop is not loop:
+            self._config_vdf_lock = asyncio.Lock()
+            self._config_vdf_lock_loop = loop
+        return self._config_vdf_lock
+
     async def depotkey_merge(self, depots_config: Dict[str, Any]) -> bool:
-        """合并密钥到config.vdf"""
+        """合并密钥到config.vdf的内存缓存（流程结束由flush_config_vdf统一写回）"""
         config_path = self.steam_path / 'config' / 'config.vdf'
-        
+
         if not config_path.exists():
             self.log.error('Steam默认配置(config.vdf)不存在')
             return False
-        
+
         try:
-            # 读取现有配置
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = vdf.loads(f.read())
-            
-            # 查找Steam配置节
-            steam_section = (config.get('InstallConfigStore', {})
+            async with self._get_config_vdf_lock():
+                if self._config_vdf_cache is None:
+                    # vdf解析是纯CPU+阻塞IO，放入线程执行；整个会话只解析一次
+                    self._config_vdf_cache = await asyncio.to_thread(
+                        lambda: vdf.loads(config_path.read_text(encoding='utf-8'))
+                    )
+
+                config = self._config_vdf_cache
+
+                # 查找Steam配置节
+                steam_section = (config.get('InstallConfigStore', {})
+                                           .get('Software', {})
+                                           .get('Valve') or
+                                config.get('InstallConfigStore', {})
                                        .get('Software', {})
-                                       .get('Valve') or 
-                            config.get('InstallConfigStore', {})
-                                   .get('Software', {})
-                                   .get('valve'))
-            
-            if not steam_section:
-                self.log.error('找不到Steam配置节')
-                return False
-            
-            # 合并密钥
-            if 'depots' not in steam_section:
-                steam_section['depots'] = {}
-            
-            steam_section['depots'].update(depots_config.get('depots', {}))
-            
-            # 写入配置（创建备份）
-            backup_path = config_path.with_suffix('.vdf.bak')
-            if not backup_path.exists():
-                shutil.copy2(config_path, backup_path)
-            
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(vdf.dumps(config, pretty=True))
-            
-            self.log.info('密钥成功合并到 config.vdf。')
+                                       .get('valve'))
+
+                if not steam_section:
+                    self.log.error('找不到Steam配置节')
+                    return False
+
+                # 合并密钥
+                if 'depots' not in steam_section:
+                    steam_section['depots'] = {}
+
+                steam_section['depots'].update(depots_config.get('depots', {}))
+                self._config_vdf_dirty = True
+
+            self.log.info('密钥已合并，待统一写回 config.vdf。')
             return True
-            
+
         except Exception as e:
             self.log.error(f'合并密钥失败: {self.stack_error(e)}')
             return False
+
+    async def flush_config_vdf(self) -> bool:
+        """把缓存的config.vdf一次性写回磁盘（每轮处理流程结束调用）"""
+        if not self._config_vdf_dirty or self._config_vdf_cache is None:
+            return True
+
+        config_path = self.steam_path / 'config' / 'config.vdf'
+
+        try:
+            async with self._get_config_vdf_lock():
+                await asyncio.to_thread(self._write_config_vdf_sync, config_path)
+                self._config_vdf_dirty = False
+                # 写回后丢弃缓存：Steam重启时会自行改写config.vdf，
+                # 下一轮合并必须基于磁盘上的最新内容重新解析
+                self._config_vdf_cache = None
+
+            self.log.info('密钥成功合并到 config.vdf。')
+            return True
+
+        except Exception as e:
+            self.log.error(f'写入config.vdf失败: {self.stack_error(e)}')
+            return False
+
+    def _write_config_vdf_sync(self, config_path: Path) -> None:
+        """config.vdf 的阻塞写回（在线程中运行，首次写回前创建备份）"""
+        backup_path = config_path.with_suffix('.vdf.bak')
+        if not backup_path.exists():
+            shutil.copy2(config_path, backup_path)
+
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write(vdf.dumps(self._config_vdf_cache, pretty=True))
     
     async def greenluma_add(self, depot_id_list: List[str]) -> bool:
         """为GreenLuma添加解锁文件"""
         try:
             app_list_path = self.steam_path / 'AppList'
-            app_list_path.mkdir(parents=True, exist_ok=True)
-            
+            self._ensure_dir(app_list_path)
+
+            valid_ids = []
             for appid in depot_id_list:
                 if not appid.isdigit():
-                    self.log.warning(f"跳过非数字AppID: {appid}")
+                    self.log.warning("跳过非数字AppID: %s", appid)
                     continue
-                    
-                file_path = app_list_path / f'{appid}.txt'
-                file_path.write_text(str(appid), encoding='utf-8')
-            
-            self.log.info(f"已为GreenLuma添加 {len(depot_id_list)} 个AppID")
+                valid_ids.append(appid)
+
+            def write_all() -> None:
+                for appid in valid_ids:
+                    (app_list_path / f'{appid}.txt').write_text(appid, encoding='utf-8')
+
+            # N个小文件在一个工作线程里一口气写完，事件循环只付一次线程切换的开销
+            await asyncio.to_thread(write_all)
+
+            self.log.info(f"已为GreenLuma添加 {len(valid_ids)} 个AppID")
             return True
             
         except Exception as e:
             self.log.error(f'为GreenLuma添加解锁文件时出错: {e}')
             return False
     
-    async def _process_zip_based_manifest(self, client: httpx.AsyncClient, app_id: str, 
+    @staticmethod
+    def _build_lua_script(app_id: str, depots, manifest_names, is_floating_version: bool) -> str:
+        """拼接SteamTools解锁脚本内容，整体一次写入比逐行写快得多
+
+        depots 为 (depot_id, key) 二元组的可迭代对象，
+        manifest_names 为含清单文件名的字符串可迭代对象。
+        """
+        lines = [f'addappid({app_id}, 1, "None")\n']
+
+        for depot_id, key in depots:
+            lines.append(f'addappid({depot_id}, 1, "{key}")\n')
+
+        for name in manifest_names:
+            if m := _MANIFEST_RE.search(name):
+                line = f'setManifestid({m.group(1)}, "{m.group(2)}")\n'
+                lines.append('--' + line if is_floating_version else line)
+
+        return ''.join(lines)
+
+    @staticmethod
+    def _extract_zip(zip_src, extract_path: Path) -> None:
+        """解压ZIP（接受路径或文件对象；阻塞操作，应通过asyncio.to_thread调用）"""
+        with zipfile.ZipFile(zip_src) as zf:
+            zf.extractall(extract_path)
+
+    async def _collect_depot_keys(self, lua_files: List[Path]) -> Dict[str, str]:
+        """并发读取LUA文件并单趟提取 depot_id -> 密钥 映射"""
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(lua_file.read_bytes) for lua_file in lua_files),
+            return_exceptions=True
+        )
+
+        all_depots: Dict[str, str] = {}
+        for lua_file, content in zip(lua_files, contents):
+            if isinstance(content, Exception):
+                self.log.error(f"读取LUA文件失败: {lua_file} - {content}")
+                continue
+            # dict.update吃生成器，键值对的插入循环留在C层；
+            # 跳过SteamTools脚本里的占位行 addappid(<appid>, 1, "None")，
+            # 它不含真实密钥，不能写进config.vdf
+            all_depots.update(
+                (m.group(1).decode(), m.group(2).decode())
+                for m in _ADDAPPID_BYTES_RE.finditer(content)
+                if m.group(2) != b'None')
+
+        return all_depots
+
+    @staticmethod
+    def _dup_file(src: Path, dst: Path) -> None:
+        """把文件镜像到另一位置：优先硬链接（免去二次写盘），失败时回退为复制"""
+        if dst.exists():
+            dst.unlink()
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    @staticmethod
+    def _copy_files(files: List[Path], dest_dirs: List[Path]) -> None:
+        """把一批文件镜像到多个目标目录（阻塞操作，应通过asyncio.to_thread调用）"""
+        for f in files:
+            for dest in dest_dirs:
+                GuiBackend._dup_file(f, dest / f.name)
+
+    async def _process_zip_based_manifest(self, client: httpx.AsyncClient, app_id: str,
                                         download_url: str, source_name: str) -> bool:
         """处理基于ZIP的清单文件"""
+        # 每个AppID使用独立的临时子目录，避免并发任务互相清理对方的文件
+        work_dir = self.temp_dir / app_id
         try:
-            # 清理并创建临时目录
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
-            self.temp_dir.mkdir(exist_ok=True)
-            
+            if work_dir.exists():
+                shutil.rmtree(work_dir, ignore_errors=True)
+            work_dir.mkdir(parents=True, exist_ok=True)
+
             self.log.info(f'[{source_name}] 正在下载清单文件: {download_url}')
-            
-            # 下载ZIP文件
-            async with client.stream("GET", download_url, timeout=60) as r:
-                if r.status_code != 200:
-                    self.log.error(f'[{source_name}] 下载失败: 状态码 {r.status_code}')
-                    return False
-                
-                zip_path = self.temp_dir / f'{app_id}.zip'
-                async with aiofiles.open(zip_path, 'wb') as f:
+
+            # 下载ZIP到内存缓冲（超过64MB自动溢出到磁盘），省去落盘再回读一趟
+            with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as zip_buf:
+                async with client.stream("GET", download_url, timeout=60) as r:
+                    if r.status_code != 200:
+                        self.log.error(f'[{source_name}] 下载失败: 状态码 {r.status_code}')
+                        return False
+
                     async for chunk in r.aiter_bytes():
-                        await f.write(chunk)
-            
-            self.log.info(f'[{source_name}] 正在解压文件...')
-            
-            # 解压文件
-            extract_path = self.temp_dir / app_id
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                zf.extractall(extract_path)
-            
-            # 查找各种文件
-            manifest_files = list(extract_path.glob('*.manifest'))
-            lua_files = list(extract_path.glob('*.lua'))
-            st_files = list(extract_path.glob('*.st'))
-            
-            # 转换ST文件为LUA
-            for st_file in st_files:
+                        zip_buf.write(chunk)
+
+                self.log.info(f'[{source_name}] 正在解压文件...')
+
+                # 解压文件（阻塞操作放入线程，避免卡住事件循环）
+                zip_buf.seek(0)
+                extract_path = work_dir / 'extracted'
+                await asyncio.to_thread(self._extract_zip, zip_buf, extract_path)
+            
+            # 查找各种文件：一趟scandir按后缀分类，省去三次独立目录扫描
+            manifest_files: List[Path] = []
+            lua_files: List[Path] = []
+            st_files: List[Path] = []
+            for entry in os.scandir(extract_path):
+                name = entry.name
+                if name.endswith('.manifest'):
+                    manifest_files.append(Path(entry.path))
+                elif name.endswith('.lua'):
+                    lua_files.append(Path(entry.path))
+                elif name.endswith('.st'):
+                    st_files.append(Path(entry.path))
+            
+            # 转换ST文件为LUA：多个文件并发转换，inflate在线程池里吃满多核
+            async def convert_one(st_file: Path) -> Optional[Path]:
                 try:
                     lua_path = st_file.with_suffix('.lua')
-                    lua_content = self.st_converter.convert_file(str(st_file))
-                    
-                    async with aiofiles.open(lua_path, 'w', encoding='utf-8') as f:
-                        await f.write(lua_content)
-                    
-                    lua_files.append(lua_path)
-                    self.log.info(f'已转换ST文件: {st_file.name}')
-                    
+                    # 读取+解密+解压都是阻塞操作，放进工作线程执行
+                    lua_content = await asyncio.to_thread(
+                        self.st_converter.convert_file, str(st_file))
+
+                    # 单次整串写入走to_thread，比aiofiles逐次分发线程更省开销
+                    await asyncio.to_thread(lua_path.write_text, lua_content, encoding='utf-8')
+
+                    self.log.info('已转换ST文件: %s', st_file.name)
+                    return lua_path
+
                 except Exception as e:
-                    self.log.error(f'转换ST文件失败: {st_file.name} - {e}')
+                    self.log.error('转换ST文件失败: %s - %s', st_file.name, e)
+                    return None
+
+            if st_files:
+                converted = await asyncio.gather(*(convert_one(f) for f in st_files))
+                lua_files.extend(p for p in converted if p is not None)
             
-            # 处理模式
-            is_st_auto_update_mode = self.is_steamtools() and self.app_config.get("steamtools_only_lua", False)
+            # 处理模式（解锁工具类型在本次操作内不会变，只查一次）
+            is_st = self.is_steamtools()
+            is_st_auto_update_mode = is_st and self.app_config.get("steamtools_only_lua", False)
             is_floating_version = is_st_auto_update_mode and not self.st_lock_manifest_version
-            
+
             # SteamTools模式
-            if self.is_steamtools():
+            if is_st:
                 st_plug = self.steam_path / 'config' / 'stplug-in'
-                st_plug.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(st_plug)
                 
                 # 标准模式：复制清单文件
                 if not is_st_auto_update_mode:
                     st_depot_path = self.steam_path / 'config' / 'depotcache'
                     gl_depot_path = self.steam_path / 'depotcache'
                     
-                    st_depot_path.mkdir(parents=True, exist_ok=True)
-                    gl_depot_path.mkdir(parents=True, exist_ok=True)
+                    self._ensure_dir(st_depot_path)
+                    self._ensure_dir(gl_depot_path)
                     
                     if manifest_files:
-                        for manifest_file in manifest_files:
-                            shutil.copy2(manifest_file, st_depot_path)
-                            shutil.copy2(manifest_file, gl_depot_path)
-                        
+                        await asyncio.to_thread(
+                            self._copy_files, manifest_files, [st_depot_path, gl_depot_path]
+                        )
                         self.log.info(f"[{source_name}] 已复制 {len(manifest_files)} 个清单文件")
                     else:
                         self.log.warning(f"[{source_name}] 未找到 .manifest 文件")
@@ -548,33 +774,14 @@ class GuiBackend:
                 lua_filename = f"{app_id}.lua"
                 lua_filepath = st_plug / lua_filename
                 
-                all_depots = {}
-                for lua_file in lua_files:
-                    try:
-                        with open(lua_file, 'r', encoding='utf-8') as f_in:
-                            content = f_in.read()
-                            
-                        # 提取密钥信息
-                        for m in re.finditer(r'addappid\((\d+),\s*1,\s*"([^"]+)"\)', content):
-                            all_depots[m.group(1)] = m.group(2)
-                    except Exception as e:
-                        self.log.error(f"读取LUA文件失败: {lua_file} - {e}")
+                all_depots = await self._collect_depot_keys(lua_files)
                 
-                # 写入LUA脚本
-                async with aiofiles.open(lua_filepath, 'w', encoding='utf-8') as f:
-                    await f.write(f'addappid({app_id}, 1, "None")\n')
-                    
-                    for depot_id, key in all_depots.items():
-                        await f.write(f'addappid({depot_id}, 1, "{key}")\n')
-                    
-                    # 添加清单版本信息
-                    for manifest_file in manifest_files:
-                        if m := re.search(r'(\d+)_(\w+)\.manifest', manifest_file.name):
-                            line = f'setManifestid({m.group(1)}, "{m.group(2)}")\n'
-                            if is_floating_version:
-                                await f.write('--' + line)
-                            else:
-                                await f.write(line)
+                # 整体拼接后一次写入LUA脚本
+                script = self._build_lua_script(
+                    app_id, all_depots.items(),
+                    (f.name for f in manifest_files), is_floating_version
+                )
+                await asyncio.to_thread(lua_filepath.write_text, script, encoding='utf-8')
                 
                 self.log.info(f'[{source_name}] 已为SteamTools生成解锁脚本: {lua_filename}')
                 return True
@@ -583,29 +790,21 @@ class GuiBackend:
             else:
                 self.log.info(f'[{source_name}] 按GreenLuma/标准模式安装。')
                 gl_depot = self.steam_path / 'depotcache'
-                gl_depot.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(gl_depot)
                 
                 if not manifest_files:
                     self.log.error(f"[{source_name}] 未找到 .manifest 文件")
                     return False
                 
                 # 复制清单文件
-                for manifest_file in manifest_files:
-                    shutil.copy2(manifest_file, gl_depot)
-                
+                await asyncio.to_thread(self._copy_files, manifest_files, [gl_depot])
+
                 self.log.info(f"已复制 {len(manifest_files)} 个清单文件")
                 
                 # 提取密钥并合并
-                all_depots = {}
-                for lua_file in lua_files:
-                    try:
-                        with open(lua_file, 'r', encoding='utf-8') as f_in:
-                            content = f_in.read()
-                            
-                        for m in re.finditer(r'addappid\((\d+),\s*"([^"]+)"\)', content):
-                            all_depots[m.group(1)] = {'DecryptionKey': m.group(2)}
-                    except Exception as e:
-                        self.log.error(f"读取LUA文件失败: {lua_file} - {e}")
+                depot_keys = await self._collect_depot_keys(lua_files)
+                all_depots = {depot_id: {'DecryptionKey': key}
+                              for depot_id, key in depot_keys.items()}
                 
                 # 合并密钥和添加AppID
                 if all_depots:
@@ -620,14 +819,14 @@ class GuiBackend:
             self.log.error(f'[{source_name}] 处理清单时出错: {self.stack_error(e)}')
             return False
         finally:
-            # 清理临时文件
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+            # 只清理本AppID的临时子目录，不影响并发中的其他任务
+            if work_dir.exists():
+                shutil.rmtree(work_dir, ignore_errors=True)
     
     async def process_from_specific_repo(self, client: httpx.AsyncClient, inputs: List[str], 
                                     repo_val: str) -> bool:
         """处理特定仓库"""
-        app_ids = await self.resolve_appids(inputs)
+        app_ids = self.resolve_appids(inputs)
         
         if not app_ids:
             self.log.error("未能解析出任何有效的AppID。")
@@ -643,8 +842,6 @@ class GuiBackend:
             if not await self.check_github_api_rate_limit(client, self.get_github_headers()):
                 return False
         
-        success_count = 0
-        
         # 定义仓库URL映射函数
         def get_repo_config(repo_name: str, app_id: str):
             """获取仓库配置"""
@@ -676,28 +873,36 @@ class GuiBackend:
             }
             return configs.get(repo_name)
         
-        for app_id in app_ids:
-            self.log.info(f"--- 正在处理 App ID: {app_id} ---")
-            success = False
-            
-            # 根据仓库类型处理
-            repo_config = get_repo_config(repo_val, app_id)
-            if repo_config:
-                # ZIP仓库处理
-                success = await self._process_zip_based_manifest(
-                    client, app_id, repo_config["url"], repo_config["source_name"]
-                )
-            else:
-                # GitHub仓库处理
-                success = await self.process_github_repo(client, app_id, repo_val)
-            
-            if success:
-                self.log.info(f"App ID: {app_id} 处理成功。")
-                success_count += 1
-            else:
-                self.log.error(f"App ID: {app_id} 处理失败。")
-        
-        return success_count > 0
+        # 各AppID相互独立，并发处理（并发数受信号量限制）
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_APPS)
+
+        async def process_one(app_id: str) -> bool:
+            async with sem:
+                self.log.info(f"--- 正在处理 App ID: {app_id} ---")
+
+                # 根据仓库类型处理
+                repo_config = get_repo_config(repo_val, app_id)
+                if repo_config:
+                    # ZIP仓库处理
+                    success = await self._process_zip_based_manifest(
+                        client, app_id, repo_config["url"], repo_config["source_name"]
+                    )
+                else:
+                    # GitHub仓库处理
+                    success = await self.process_github_repo(client, app_id, repo_val)
+
+                if success:
+                    self.log.info(f"App ID: {app_id} 处理成功。")
+                else:
+                    self.log.error(f"App ID: {app_id} 处理失败。")
+                return success
+
+        results = await asyncio.gather(*(process_one(app_id) for app_id in app_ids))
+
+        # 所有AppID处理完后统一写回config.vdf
+        await self.flush_config_vdf()
+
+        return any(results)
 
     
     async def cleanup_temp_files(self) -> None:
@@ -712,7 +917,7 @@ class GuiBackend:
     async def process_by_searching_all(self, client: httpx.AsyncClient, inputs: List[str], 
                                      github_repos: List[str]) -> bool:
         """搜索所有仓库处理"""
-        app_ids = await self.resolve_appids(inputs)
+        app_ids = self.resolve_appids(inputs)
         
         if not app_ids:
             self.log.error("未能解析出任何有效的AppID。")
@@ -723,44 +928,95 @@ class GuiBackend:
         if not await self.check_github_api_rate_limit(client, self.get_github_headers()):
             return False
         
-        success_count = 0
-        for app_id in app_ids:
-            self.log.info(f"--- 正在为 App ID: {app_id} 搜索所有GitHub库 ---")
-            
-            repo_results = await self.search_all_repos(client, app_id, github_repos)
-            
-            if not repo_results:
-                self.log.error(f"在所有GitHub库中均未找到 {app_id} 的清单。")
-                continue
-            
-            # 按更新时间排序，选择最新的
-            repo_results.sort(key=lambda x: x['update_date'], reverse=True)
-            selected = repo_results[0]
-            
-            self.log.info(f"找到 {len(repo_results)} 个结果，将使用最新的清单: "
-                         f"{selected['repo']} (更新于 {selected['update_date']})")
-            
-            if await self.process_github_repo(client, app_id, selected['repo'], selected):
-                self.log.info(f"App ID: {app_id} 处理成功。")
-                success_count += 1
-            else:
+        # 各AppID相互独立，并发处理（并发数受信号量限制）
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_APPS)
+
+        async def process_one(app_id: str) -> bool:
+            async with sem:
+                self.log.info(f"--- 正在为 App ID: {app_id} 搜索所有GitHub库 ---")
+
+                repo_results = await self.search_all_repos(client, app_id, github_repos)
+
+                if not repo_results:
+                    self.log.error(f"在所有GitHub库中均未找到 {app_id} 的清单。")
+                    return False
+
+                # 按更新时间排序，选择最新的
+                repo_results.sort(key=itemgetter('update_date'), reverse=True)
+                selected = repo_results[0]
+
+                self.log.info(f"找到 {len(repo_results)} 个结果，将使用最新的清单: "
+                             f"{selected['repo']} (更新于 {selected['update_date']})")
+
+                if await self.process_github_repo(client, app_id, selected['repo'], selected):
+                    self.log.info(f"App ID: {app_id} 处理成功。")
+                    return True
+
                 self.log.error(f"App ID: {app_id} 处理失败。")
-        
-        return success_count > 0
+                return False
+
+        results = await asyncio.gather(*(process_one(app_id) for app_id in app_ids))
+
+        # 所有AppID处理完后统一写回config.vdf
+        await self.flush_config_vdf()
+
+        return any(results)
     
-    async def search_games_by_name(self, client: httpx.AsyncClient, game_name: str) -> List[Dict[str, Any]]:
+    async def _acquire_search_slot(self) -> None:
+        """等待并占用一个搜索请求名额"""
+        async with self._search_cond:
+            await self._search_cond.wait_for(lambda: self._search_in_flight < self._search_max)
+            self._search_in_flight += 1
+
+    async def _release_search_slot(self) -> None:
+        """释放搜索请求名额并唤醒一个等待者"""
+        async with self._search_cond:
+            self._search_in_flight -= 1
+            self._search_cond.notify(1)
+
+    async def set_search_concurrency(self, limit: int) -> None:
+        """运行时调整搜索并发上限，调大时唤醒全部等待者"""
+        async with self._search_cond:
+            self._search_max = max(1, limit)
+            self._search_cond.notify_all()
+
+    def _store_search_result(self, cache_key: str, games: List[Dict[str, Any]]) -> None:
+        """写入搜索缓存：先清掉过期条目，仍然超限时按插入顺序淘汰最旧的"""
+        now = time.monotonic()
+        cache = self._search_cache
+        expired = [key for key, (ts, _) in cache.items()
+                   if now - ts >= self.SEARCH_CACHE_TTL]
+        for key in expired:
+            del cache[key]
+        cache.pop(cache_key, None)
+        while len(cache) >= self.SEARCH_CACHE_MAX:
+            del cache[next(iter(cache))]
+        cache[cache_key] = (now, games)
+
+    async def search_games_by_name(self, game_name: str, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
         """通过名称搜索游戏"""
         try:
-            self.log.info(f"搜索游戏: '{game_name}'")
-            
+            # 重复搜索（用户重试、切换页签）直接命中缓存，避免再次请求Steam
+            cache_key = game_name.strip().casefold()
+            cached = self._search_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self.SEARCH_CACHE_TTL:
+                self.log.info("搜索游戏: '%s' (缓存命中)", game_name)
+                return cached[1]
+
+            if client is None:
+                client = await self.get_client()
+            self.log.info("搜索游戏: '%s'", game_name)
+
             # 尝试Steam商店搜索
             games = await self._search_steam_store(client, game_name)
-            
-            self.log.info(f"找到 {len(games)} 个匹配的游戏。")
+
+            self.log.info("找到 %d 个匹配的游戏。", len(games))
+            if games:
+                self._store_search_result(cache_key, games)
             return games
             
         except Exception as e:
-            self.log.error(f"搜索游戏失败: {e}")
+            self.log.error("搜索游戏失败: %s", e)
             return []
     
     async def _search_steam_store(self, client: httpx.AsyncClient, game_name: str) -> List[Dict[str, Any]]:
@@ -768,9 +1024,11 @@ class GuiBackend:
         try:
             games = []
             
-            # 同时搜索国区和美区
-            cn_games = await self._search_with_region(client, game_name, 'CN')
-            us_games = await self._search_with_region(client, game_name, 'US')
+            # 国区和美区并发搜索，总耗时取决于较慢的一路而非两路之和
+            cn_games, us_games = await asyncio.gather(
+                self._search_with_region(client, game_name, 'CN'),
+                self._search_with_region(client, game_name, 'US'),
+            )
             
             # 合并结果，去重
             seen_ids = set()
@@ -790,52 +1048,61 @@ class GuiBackend:
                     seen_ids.add(game['appid'])
             
             return games[:20]
-            
-        except Exception as e:
-            self.log.error(f"Steam商店搜索失败: {e}")
+
+        except httpx.HTTPError as e:
+            self.log.error("Steam商店搜索失败: %s", e)
             return []
     
     async def _search_with_region(self, client: httpx.AsyncClient, game_name: str, country_code: str) -> List[Dict[str, Any]]:
         """使用指定地区搜索Steam商店"""
         try:
-            url = 'https://store.steampowered.com/api/storesearch/'
             # 根据地区选择语言，默认为 english
-            language_map = {
-                'CN': 'schinese',
-                'US': 'english',
-            }
-            language = language_map.get(country_code, 'english')
-
+            language = _STEAM_LANGUAGE_MAP.get(country_code, 'english')
             params = {'term': game_name, 'l': language, 'cc': country_code}
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36',
-                'Accept': 'application/json',
-            }
-            
-            r = await client.get(url, params=params, headers=headers, timeout=15)
+
+            await self._acquire_search_slot()
+            try:
+                r = await client.get(_STEAM_SEARCH_URL, params=params,
+                                     headers=_STEAM_SEARCH_HEADERS,
+                                     timeout=_STEAM_SEARCH_TIMEOUT)
+            finally:
+                await self._release_search_slot()
             
             if r.status_code != 200:
                 return []
             
-            data = r.json()
-            games = []
-            
-            for item in data.get('items', []):
-                if item.get('type') in ['bundle', 'sub', 'dlc']:
-                    continue
-                    
-                games.append({
+            # 绕过r.json()走json_loads，装有orjson时解码更快
+            data = json_loads(r.content)
+
+            # 单趟列表推导构建结果，name只查一次字典；
+            # islice在凑满20条后立即停止遍历，后面的条目不再解析
+            wanted = (
+                item for item in data.get('items', ())
+                if item.get('type') not in ('bundle', 'sub', 'dlc')
+            )
+            return [
+                {
                     'appid': item['id'],
-                    'name': item['name'],
-                    'schinese_name': item['name'],
-                    'type': item.get('type', 'Game'),
-                    'region': country_code
-                })
-            
-            return games
-            
-        except Exception:
+                    'name': (name := item['name']),
+                    'schinese_name': name,
+                    'type': item.get('type', _GAME),
+                    'region': country_code,
+                }
+                for item in islice(wanted, 20)
+            ]
+
+        # 只吞掉网络和解码类异常，解析逻辑自身的编程错误照常抛出
+        except httpx.ConnectTimeout:
+            self.log.warning("%s区搜索连接超时", country_code)
+            return []
+        except httpx.ReadTimeout:
+            self.log.warning("%s区搜索读取超时", country_code)
+            return []
+        except httpx.HTTPError as e:
+            self.log.warning("%s区搜索请求失败: %s", country_code, e)
+            return []
+        except ValueError as e:
+            self.log.warning("%s区搜索响应解析失败: %s", country_code, e)
             return []
     
 
@@ -4,23 +4,61 @@ import re
 import time
 import asyncio
 import logging
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+from .io import json_loads, json_dumps, get_app_dir
+
 try:
     import httpx
 except ImportError:
     raise ImportError("缺少 httpx 库，请使用 'pip install httpx' 安装。")
 
+# h2 为可选依赖：存在时启用HTTP/2多路复用，减少每个请求的连接开销
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+@lru_cache(maxsize=32)
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    """把版本号字符串解析成整数元组，结果缓存避免重复解析"""
+    return tuple(int(part) for part in version.lstrip('v').strip().split('.'))
+
+
+# GitHub下载的国内镜像前缀，按优先级排列
+_MIRROR_PREFIXES = ('https://ghfast.top/', 'https://wget.la/')
+
+# 模块级预编译正则，避免每次调用重复编译
+_APPID_PATTERNS = [
+    re.compile(r"store\.steampowered\.com/app/(\d+)"),
+    re.compile(r"steamdb\.info/app/(\d+)"),
+    re.compile(r"steamcommunity\.com/app/(\d+)"),
+]
+
 
 class GithubClient:
     """GitHub API 客户端"""
-    
+
+    # GitHub API 响应缓存的有效期（秒），同时降低延迟和API配额消耗
+    API_CACHE_TTL = 60.0
+
+    # 地理位置检测结果的磁盘缓存有效期（秒），地区一天内基本不会变
+    GEO_CACHE_TTL = 86400.0
+
     def __init__(self, logger: logging.Logger, app_config: Dict[str, Any]):
         self.log = logger
         self.app_config = app_config
         self.last_detected_region: Optional[str] = None
         self.current_country: Optional[str] = None
         self._client_cache: Optional[httpx.AsyncClient] = None
+        self._api_cache: Dict[str, Tuple[float, Any]] = {}
+
+    def clear_api_cache(self) -> None:
+        """手动清空API响应缓存"""
+        self._api_cache.clear()
     
     def get_github_headers(self) -> Dict[str, str]:
         """获取GitHub请求头"""
@@ -32,10 +70,21 @@ class GithubClient:
     async def get_client(self) -> httpx.AsyncClient:
         """获取或创建HTTP客户端"""
         if self._client_cache is None:
+            # 个别国内镜像站证书链不完整：只对这些主机挂载免校验的transport，
+            # GitHub API/Steam等其余流量保持默认的TLS证书验证
+            mounts = {
+                prefix.rstrip('/'): httpx.AsyncHTTPTransport(
+                    verify=False, http2=_HTTP2_AVAILABLE)
+                for prefix in _MIRROR_PREFIXES
+            }
             self._client_cache = httpx.AsyncClient(
                 timeout=30.0,
                 follow_redirects=True,
-                headers={'User-Agent': 'Cai-Installer-GUI/1.0'}
+                headers={'User-Agent': 'Cai-Installer-GUI/1.0'},
+                # 连接池复用同一主机的连接，避免大量小文件下载时反复TCP+TLS握手
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                http2=_HTTP2_AVAILABLE,
+                mounts=mounts
             )
         return self._client_cache
     
@@ -56,7 +105,7 @@ class GithubClient:
             r = await client.get('https://api.github.com/rate_limit', headers=headers)
             r.raise_for_status()
             
-            rate = r.json().get('resources', {}).get('core', {})
+            rate = json_loads(r.content).get('resources', {}).get('core', {})
             remaining = rate.get('remaining', 0)
             limit = rate.get('limit', 60)
             
@@ -72,18 +121,49 @@ class GithubClient:
             self.log.error(f'检查GitHub API速率时出错: {e}')
             return False
     
+    def _load_geo_cache(self) -> Optional[Tuple[str, str]]:
+        """读取地理位置检测的磁盘缓存，过期或损坏时返回None"""
+        cache_path = get_app_dir() / '.geo_cache.json'
+        try:
+            data = json_loads(cache_path.read_bytes())
+            if time.time() - data['ts'] < self.GEO_CACHE_TTL:
+                return data['region'], data['country']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_geo_cache(self, region: str, country: str) -> None:
+        """将地理位置检测结果写入磁盘缓存"""
+        cache_path = get_app_dir() / '.geo_cache.json'
+        try:
+            cache_path.write_text(
+                json_dumps({'region': region, 'country': country, 'ts': time.time()}),
+                encoding='utf-8')
+        except OSError as e:
+            self.log.debug(f"地理位置缓存写入失败: {e}")
+
     async def checkcn(self, client: Optional[httpx.AsyncClient] = None) -> None:
         """检测是否在中国大陆"""
-        temp_client = None
+        # 本会话已检测过则直接返回
+        if self.last_detected_region is not None and 'IS_CN' in os.environ:
+            return
+
+        # 磁盘缓存仍然新鲜时跳过外部API请求
+        cached = self._load_geo_cache()
+        if cached is not None:
+            region, country = cached
+            self.last_detected_region = region
+            self.current_country = country
+            os.environ['IS_CN'] = 'yes' if region == 'cn' else 'no'
+            self.log.info(f"使用缓存的地理位置检测结果: {country}")
+            return
+
         current_region = None
         current_country = None
-        
+
         try:
-            if client is None:
-                temp_client = httpx.AsyncClient(timeout=10)
-                client_to_use = temp_client
-            else:
-                client_to_use = client
+            # 未显式传入时复用共享客户端，避免每次检测都重建连接池+TLS握手
+            client_to_use = client if client is not None else await self.get_client()
             
             # 地理位置检测API
             check_apis = [
@@ -104,7 +184,7 @@ class GithubClient:
                     r = await client_to_use.get(api_info['url'], timeout=5, follow_redirects=True)
                     
                     if r.status_code == 200:
-                        data = r.json()
+                        data = json_loads(r.content)
                         region_result, country_result = api_info['parser'](data)
                         
                         if region_result and country_result:
@@ -113,7 +193,11 @@ class GithubClient:
                             break
                 except Exception:
                     continue
-            
+
+            # API检测成功时落盘缓存，之后24小时内免去外部请求
+            if current_region is not None:
+                self._save_geo_cache(current_region, current_country)
+
             # 处理检测结果
             if current_region is None:
                 current_region = 'cn'
@@ -159,9 +243,6 @@ class GithubClient:
                 self.current_country = current_country
             elif self.current_country is None:
                 self.current_country = 'CN' if current_region == 'cn' else 'Unknown'
-        finally:
-            if temp_client:
-                await temp_client.aclose()
     
     def get_current_country(self) -> str:
         """获取当前检测到的国家代码"""
@@ -177,7 +258,12 @@ class GithubClient:
         return 'Unknown'
     
     async def fetch_branch_info(self, client: httpx.AsyncClient, url: str, headers: dict) -> Optional[Dict[str, Any]]:
-        """获取分支信息"""
+        """获取分支信息（带短期响应缓存）"""
+        cached = self._api_cache.get(url)
+        if cached and time.monotonic() - cached[0] < self.API_CACHE_TTL:
+            self.log.debug(f"使用缓存的API响应: {url}")
+            return cached[1]
+
         try:
             self.log.debug(f"请求 GitHub API: {url}")
             r = await client.get(url, headers=headers)
@@ -199,8 +285,10 @@ class GithubClient:
                 return None
             
             r.raise_for_status()
-            return r.json()
-            
+            data = json_loads(r.content)
+            self._api_cache[url] = (time.monotonic(), data)
+            return data
+
         except httpx.HTTPStatusError as e:
             status_code = e.response.status_code
             self.log.error(f"HTTP错误 {status_code}: {url}")
@@ -242,14 +330,8 @@ class GithubClient:
     
     def extract_app_id(self, user_input: str) -> Optional[str]:
         """从输入中提取AppID"""
-        patterns = [
-            r"store\.steampowered\.com/app/(\d+)",
-            r"steamdb\.info/app/(\d+)",
-            r"steamcommunity\.com/app/(\d+)"
-        ]
-        
-        for pattern in patterns:
-            if match := re.search(pattern, user_input):
+        for pattern in _APPID_PATTERNS:
+            if match := pattern.search(user_input):
                 return match.group(1)
         
         # 检查是否为纯数字
@@ -258,106 +340,106 @@ class GithubClient:
         
         return None
     
-    async def resolve_appids(self, inputs: List[str]) -> List[str]:
-        """解析多个AppID"""
-        resolved_ids = []
-        
+    def resolve_appids(self, inputs: List[str]) -> List[str]:
+        """解析多个AppID（纯CPU操作，无需async）"""
+        resolved = []
+
         for item in inputs:
             item = item.strip()
             if not item:
                 continue
-                
+
             if app_id := self.extract_app_id(item):
-                resolved_ids.append(app_id)
+                resolved.append(app_id)
             else:
                 self.log.warning(f"输入项 '{item}' 不是有效的AppID或链接，已跳过。")
-        
-        # 去重并保持原始顺序
-        seen = set()
-        unique_ids = []
-        for app_id in resolved_ids:
-            if app_id not in seen:
-                seen.add(app_id)
-                unique_ids.append(app_id)
-        
-        return unique_ids
+
+        # dict.fromkeys 在C层去重且保持插入顺序
+        return list(dict.fromkeys(resolved))
     
     async def search_all_repos(self, client: httpx.AsyncClient, app_id: str, repos: List[str]) -> List[Dict[str, Any]]:
-        """在所有仓库中搜索"""
-        results = []
-        
-        for repo in repos:
+        """在所有仓库中并发搜索"""
+        headers = self.get_github_headers()
+
+        async def probe_repo(repo: str) -> Optional[Dict[str, Any]]:
             self.log.info(f"搜索仓库: {repo}")
-            headers = self.get_github_headers()
-            
+
             branch_url = f'https://api.github.com/repos/{repo}/branches/{app_id}'
             branch_info = await self.fetch_branch_info(client, branch_url, headers)
-            
-            if not branch_info:
-                continue
-            
-            if 'commit' not in branch_info:
-                continue
-            
+
+            if not branch_info or 'commit' not in branch_info:
+                return None
+
             tree_url = branch_info['commit']['commit']['tree']['url']
             tree_info = await self.fetch_branch_info(client, tree_url, headers)
-            
+
             if not tree_info or 'tree' not in tree_info:
-                continue
-            
-            results.append({
+                return None
+
+            self.log.info(f"在仓库 {repo} 中找到清单。")
+            return {
                 'repo': repo,
                 'sha': branch_info['commit']['sha'],
                 'tree': tree_info['tree'],
                 'update_date': branch_info['commit']['commit']['author']['date']
-            })
-            self.log.info(f"在仓库 {repo} 中找到清单。")
-        
+            }
+
+        # 所有仓库的探测并发进行，总耗时由 sum(RTT) 降为 max(RTT)
+        probes = await asyncio.gather(*(probe_repo(repo) for repo in repos), return_exceptions=True)
+
+        results = []
+        for repo, res in zip(repos, probes):
+            if isinstance(res, Exception):
+                self.log.error(f"搜索仓库 {repo} 时出错: {res}")
+            elif res:
+                results.append(res)
+
         return results
     
     async def check_for_updates(self, current_version: str) -> Dict[str, Any]:
         """检查更新"""
         try:
             headers = self.get_github_headers()
-            
-            async with httpx.AsyncClient() as client:
-                await self.checkcn(client)
-                
-                # 获取最新发布信息
-                url = "https://api.github.com/repos/WingChunWong/Cai-Installer-GUI/releases/latest"
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                
-                release_info = response.json()
-                latest_version = release_info.get('tag_name', '').lstrip('v')
-                
-                # 比较版本
-                if self.is_newer_version(latest_version, current_version):
-                    # 查找exe文件
-                    download_url = ''
-                    for asset in release_info.get('assets', []):
-                        if asset['name'].endswith('.exe'):
-                            download_url = asset['browser_download_url']
-                            break
-                    
-                    # 生成镜像地址
-                    mirror_url = ''
-                    if os.environ.get('IS_CN') == 'yes' and download_url:
-                        mirror_url = self.convert_github_to_mirror(download_url)
-                    
-                    return {
-                        'has_update': True,
-                        'latest_version': latest_version,
-                        'current_version': current_version,
-                        'release_url': release_info.get('html_url', ''),
-                        'download_url': download_url,
-                        'mirror_url': mirror_url,
-                        'release_notes': release_info.get('body', ''),
-                        'published_at': release_info.get('published_at', '')
-                    }
-                
-                return {'has_update': False}
-                
+
+            # 复用共享客户端，免去每次检查更新都重新TLS握手
+            client = await self.get_client()
+            await self.checkcn(client)
+
+            # 获取最新发布信息
+            url = "https://api.github.com/repos/WingChunWong/Cai-Installer-GUI/releases/latest"
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+
+            release_info = json_loads(response.content)
+            latest_version = release_info.get('tag_name', '').lstrip('v')
+
+            # 比较版本
+            if self.is_newer_version(latest_version, current_version):
+                # 查找exe文件
+                download_url = ''
+                for asset in release_info.get('assets', []):
+                    if asset['name'].endswith('.exe'):
+                        download_url = asset['browser_download_url']
+                        break
+
+                # 生成镜像地址
+                mirror_url = ''
+                if os.environ.get('IS_CN') == 'yes' and download_url:
+                    mirror_url = self.convert_github_to_mirror(download_url)
+
+                return {
+                    'has_update': True,
+                    'latest_version': latest_version,
+                    'current_version': current_version,
+                    'release_url': release_info.get('html_url', ''),
+                    'download_url': download_url,
+                    'mirror_url': mirror_url,
+                    'release_notes': release_info.get('body', ''),
+                    'published_at': release_info.get('published_at', '')
+                }
+
+            return {'has_update': False}
+
         except Exception as e:
             self.log.error(f"检查更新失败: {str(e)}")
             return {'has_update': False, 'error': str(e)}
@@ -365,18 +447,16 @@ class GithubClient:
     def is_newer_version(self, latest: str, current: str) -> bool:
         """比较版本号"""
         try:
-            latest_clean = latest.lstrip('v').strip()
-            current_clean = current.lstrip('v').strip()
-            
-            latest_parts = list(map(int, latest_clean.split('.')))
-            current_parts = list(map(int, current_clean.split('.')))
-            
+            latest_parts = _version_tuple(latest)
+            current_parts = _version_tuple(current)
+
+            # 补零到相同长度再比较，保证 1.2 与 1.2.0 相等
             max_len = max(len(latest_parts), len(current_parts))
-            latest_parts += [0] * (max_len - len(latest_parts))
-            current_parts += [0] * (max_len - len(current_parts))
-            
+            latest_parts += (0,) * (max_len - len(latest_parts))
+            current_parts += (0,) * (max_len - len(current_parts))
+
             return latest_parts > current_parts
-            
+
         except Exception as e:
             self.log.error(f"版本号比较失败: {e}")
             return False
@@ -385,13 +465,9 @@ class GithubClient:
         """转换为国内镜像地址"""
         if not github_url:
             return ""
-        
-        mirrors = [
-            f'https://ghfast.top/{github_url}',
-            f'https://wget.la/{github_url}'
-        ]
-        
-        return mirrors[0] if mirrors else ""
+
+        # 目前固定使用首选镜像，_MIRROR_PREFIXES保留备用源供以后做故障转移
+        return _MIRROR_PREFIXES[0] + github_url
     
     async def download_update_direct(self, url: str, dest_path: str, progress_callback=None) -> bool:
         """直接下载更新文件"""
@@ -409,15 +485,29 @@ class GithubClient:
                 
                 if total_size:
                     self.log.info(f"文件大小: {total_size / 1024 / 1024:.2f} MB")
-                
-                # 下载文件
+
+                # 小文件一次读完整体写盘，省去流式循环的逐块await和小写入
+                if 0 < total_size <= 32 * 1024 * 1024:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    body = response.content
+                    await asyncio.to_thread(Path(dest_path).write_bytes, body)
+                    if progress_callback:
+                        progress_callback(len(body), total_size)
+                    self.log.info(f"下载完成: {dest_path} ({len(body)} 字节)")
+                    if len(body) != total_size:
+                        self.log.warning(f"下载大小不匹配: 期望 {total_size}, 实际 {len(body)}")
+                    return True
+
+                # 大文件（或未知大小）仍走流式下载
                 async with client.stream('GET', url) as response:
                     response.raise_for_status()
                     
                     downloaded_size = 0
                     
                     with open(dest_path, 'wb') as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
+                        # 1MB大块读取：大文件下载时把await次数和write系统调用降低两个数量级
+                        async for chunk in response.aiter_bytes(chunk_size=1 << 20):
                             f.write(chunk)
                             downloaded_size += len(chunk)
                             
@@ -426,11 +516,17 @@ class GithubClient:
                                 progress_callback(downloaded_size, total_size)
                     
                     self.log.info(f"下载完成: {dest_path} ({downloaded_size} 字节)")
+
+                    if total_size > 0 and downloaded_size != total_size:
+                        self.log.warning(f"下载大小不匹配: 期望 {total_size}, 实际 {downloaded_size}")
+
                     return True
-                    
+
         except httpx.HTTPStatusError as e:
             self.log.error(f"HTTP错误: {e.response.status_code}")
+            Path(dest_path).unlink(missing_ok=True)
             return False
         except Exception as e:
             self.log.error(f"下载失败: {str(e)}")
+            Path(dest_path).unlink(missing_ok=True)
             return False
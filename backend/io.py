@@ -2,6 +2,29 @@
 import sys
 from pathlib import Path
 
+# orjson 为可选加速依赖：编解码比标准库快数倍，缺失时回退标准库json
+try:
+    import orjson
+
+    def json_loads(data):
+        """解析JSON字符串或字节串"""
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> str:
+        """序列化为带两格缩进的JSON字符串"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+except ImportError:
+    import json
+
+    def json_loads(data):
+        """解析JSON字符串或字节串"""
+        return json.loads(data)
+
+    def json_dumps(obj) -> str:
+        """序列化为带两格缩进的JSON字符串"""
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # 默认配置
 DEFAULT_CONFIG = {
     "Github_Personal_Token": "",
@@ -1,9 +1,20 @@
 """ST 文件转换器 (SteamTools 支持)"""
-import struct
 import zlib
 import logging
 from typing import Tuple
 
+# NumPy 为可选加速依赖：存在时XOR解密走C级SIMD内核，缺失时回退纯Python实现
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# isal 为可选加速依赖：ISA-L的inflate比原生zlib快2-3倍，接口与zlib兼容
+try:
+    from isal import isal_zlib as _zlib
+except ImportError:
+    _zlib = zlib
+
 
 class STConverter:
     """ST文件转换器"""
@@ -20,6 +31,47 @@ class STConverter:
             self.logger.error(f'ST文件转换失败: {st_path} - {e}')
             raise
     
+    @staticmethod
+    def _xor_bytes(encrypted_data: bytes, xorkey: int) -> bytes:
+        """用单字节密钥XOR解密数据"""
+        if np is not None:
+            # 向量化：整个缓冲区在NumPy的C内核中一次完成
+            arr = np.frombuffer(encrypted_data, dtype=np.uint8)
+            return np.bitwise_xor(arr, np.uint8(xorkey)).tobytes()
+
+        # 纯stdlib回退：单字节密钥的XOR恰好等价于一张256项的字节映射表，
+        # bytes.translate 在C层一趟完成，无需任何Python循环
+        table = bytes(b ^ xorkey for b in range(256))
+        return encrypted_data.translate(table)
+
+    # 解密/解压的分块大小：分块让两趟处理留在CPU缓存内，
+    # 并避免为整个解密结果再分配一份完整的中间缓冲区
+    _CHUNK_SIZE = 256 * 1024
+
+    @classmethod
+    def _decrypt_and_decompress(cls, encrypted_data: bytes, xorkey: int, skip: int = 0) -> bytes:
+        """分块XOR解密并流式解压，避免完整的中间解密缓冲区
+
+        skip 指定丢弃的解压输出前缀字节数，在流式阶段直接跳过，
+        免去对完整解压结果再做一次 [skip:] 切片拷贝。
+        """
+        decomp = _zlib.decompressobj()
+        out = bytearray()
+        to_skip = skip
+        for off in range(0, len(encrypted_data), cls._CHUNK_SIZE):
+            chunk = cls._xor_bytes(encrypted_data[off:off + cls._CHUNK_SIZE], xorkey)
+            piece = decomp.decompress(chunk)
+            if to_skip:
+                dropped = min(to_skip, len(piece))
+                piece = piece[dropped:]
+                to_skip -= dropped
+            out += piece
+        tail = decomp.flush()
+        if to_skip:
+            tail = tail[min(to_skip, len(tail)):]
+        out += tail
+        return bytes(out)
+
     def parse_st_file(self, st_file_path: str) -> Tuple[str, dict]:
         """解析ST文件"""
         try:
@@ -29,8 +81,9 @@ class STConverter:
             if len(content) < 12:
                 raise ValueError("文件头长度不足")
             
-            header = content[:12]
-            xorkey, size, _ = struct.unpack('III', header)
+            # 头部为3个小端uint32，第三个字段未使用，直接切片解析
+            xorkey = int.from_bytes(content[0:4], 'little')
+            size = int.from_bytes(content[4:8], 'little')
             xorkey ^= 0xFFFEA4C8
             xorkey &= 0xFF
             
@@ -38,15 +91,11 @@ class STConverter:
             if len(encrypted_data) < size:
                 raise ValueError(f"数据长度不足，期望{size}字节，实际{len(encrypted_data)}字节")
             
-            data = bytearray(encrypted_data)
-            for i in range(len(data)):
-                data[i] ^= xorkey
-            
-            decompressed_data = zlib.decompress(data)
-            content_str = decompressed_data[512:].decode('utf-8')
+            # 前512字节为元数据头，在流式解压阶段直接跳过
+            content_str = self._decrypt_and_decompress(encrypted_data, xorkey, skip=512).decode('utf-8')
             
             metadata = {'original_xorkey': xorkey, 'size': size}
             return content_str, metadata
             
-        except (struct.error, zlib.error, UnicodeDecodeError) as e:
+        except (_zlib.error, UnicodeDecodeError) as e:
             raise ValueError(f"ST文件解析失败: {e}")
@@ -20,6 +20,16 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
+# 可选的libuv事件循环：装有winloop（Windows）或uvloop时降低异步调度开销
+try:
+    if sys.platform == 'win32':
+        import winloop as _uvloop
+    else:
+        import uvloop as _uvloop
+    _uvloop.install()
+except ImportError:
+    pass
+
 # 导入 GUI 应用
 from ui.app import CaiInstallGUI
 
@@ -38,6 +38,31 @@ if sys.platform == 'win32':
     except:
         pass
 
+class AsyncRunner:
+    """后台常驻事件循环
+
+    所有异步任务提交到同一个loop执行，使HTTP连接池、锁等
+    绑定事件循环的资源可以跨操作复用，避免每次任务重建loop和客户端。
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro):
+        """提交协程到后台循环并阻塞等待结果（从工作线程调用）"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def shutdown(self):
+        """停止后台循环"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
 class UpdateManager:
     """更新管理器"""
     
@@ -77,26 +102,33 @@ class UpdateManager:
             
             if temp_path.exists():
                 temp_path.unlink()
-            
+
             # 下载更新
             self.log.info("开始下载更新文件...")
-            
+
+            # 后端回调提供(已下载, 总量)，转换成UI进度条需要的百分比
+            backend_cb = None
+            if progress_callback:
+                def backend_cb(downloaded: int, total: int) -> None:
+                    if total > 0:
+                        progress_callback(downloaded / total * 100)
+
             # 根据地区选择下载源
             if os.environ.get('IS_CN') == 'yes':
                 self.log.info("检测到中国大陆地区，使用镜像下载")
                 mirror_url = self.backend.convert_github_to_mirror(download_url)
                 if mirror_url:
-                    success = await self.download_update_direct(
-                        mirror_url, str(temp_path), progress_callback
+                    success = await self.backend.download_update_direct(
+                        mirror_url, str(temp_path), backend_cb
                     )
                     if success and temp_path.exists():
                         self.rename_temp_to_final(temp_path, update_path)
                         return str(update_path)
-            
+
             # 如果镜像下载失败或不在中国大陆，使用原地址
             self.log.info("使用GitHub官方源下载")
-            success = await self.download_update_direct(
-                download_url, str(temp_path), progress_callback
+            success = await self.backend.download_update_direct(
+                download_url, str(temp_path), backend_cb
             )
             
             if success and temp_path.exists():
@@ -134,57 +166,6 @@ class UpdateManager:
                 self.log.error(f"复制文件失败: {e2}")
                 raise
     
-    async def download_update_direct(self, url: str, dest_path: str, progress_callback=None) -> bool:
-        """直接下载更新文件"""
-        try:
-            self.log.info(f"下载更新: {url}")
-            
-            async with httpx.AsyncClient(
-                timeout=60,
-                follow_redirects=True,
-                headers={'User-Agent': 'Mozilla/5.0'}
-            ) as client:
-                # 获取文件大小
-                head_response = await client.head(url, follow_redirects=True)
-                total_size = int(head_response.headers.get('content-length', 0))
-                
-                if total_size:
-                    self.log.info(f"文件大小: {total_size / 1024 / 1024:.2f} MB")
-                
-                # 下载文件
-                async with client.stream('GET', url) as response:
-                    response.raise_for_status()
-                    
-                    downloaded_size = 0
-                    
-                    with open(dest_path, 'wb') as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            f.write(chunk)
-                            downloaded_size += len(chunk)
-                            
-                            # 更新进度
-                            if progress_callback and total_size > 0:
-                                percent = (downloaded_size / total_size) * 100
-                                progress_callback(percent)
-                    
-                    self.log.info(f"下载完成: {dest_path} ({downloaded_size} 字节)")
-                    
-                    if total_size > 0 and downloaded_size != total_size:
-                        self.log.warning(f"下载大小不匹配: 期望 {total_size}, 实际 {downloaded_size}")
-                    
-                    return True
-                    
-        except httpx.HTTPStatusError as e:
-            self.log.error(f"HTTP错误: {e.response.status_code}")
-            if os.path.exists(dest_path):
-                os.remove(dest_path)
-            return False
-        except Exception as e:
-            self.log.error(f"下载失败: {str(e)}")
-            if os.path.exists(dest_path):
-                os.remove(dest_path)
-            return False
-
 class CaiInstallGUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -212,6 +193,9 @@ class CaiInstallGUI:
         
         # 初始化后端
         self.backend = GuiBackend(self.log)
+
+        # 后台事件循环：全部异步操作共用，复用同一个HTTP连接池
+        self.async_runner = AsyncRunner()
         
         # 创建菜单
         self.create_menu()
@@ -613,16 +597,10 @@ class CaiInstallGUI:
             return
         
         def thread_target():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            client = httpx.AsyncClient(verify=False, timeout=60.0)
-            
             try:
-                games = loop.run_until_complete(self.backend.search_games_by_name(client, search_term))
+                games = self.async_runner.run(self.backend.search_games_by_name(search_term))
                 self.root.after(0, self.show_game_selection_dialog, games)
             finally:
-                loop.run_until_complete(client.aclose())
-                loop.close()
                 self.processing_lock.release()
                 self.root.after(0, self.search_finished)
         
@@ -674,17 +652,11 @@ class CaiInstallGUI:
         notebook_tab = self.notebook.index('current')
         
         def thread_target():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            client = httpx.AsyncClient(verify=False, timeout=60.0)
-            
             try:
-                success = loop.run_until_complete(self.run_async_tasks(client, notebook_tab))
+                success = self.async_runner.run(self.run_async_tasks(notebook_tab))
                 if success:
                     self.root.after(0, self.auto_restart_steam, "游戏入库")
             finally:
-                loop.run_until_complete(client.aclose())
-                loop.close()
                 self.processing_lock.release()
                 self.root.after(0, self.processing_finished)
         
@@ -702,14 +674,15 @@ class CaiInstallGUI:
         self.status_label.config(text="处理完成，准备就绪。")
         self.log.info("=" * 60 + "\n处理完成！您可以开始新的任务。")
     
-    async def run_async_tasks(self, client: httpx.AsyncClient, tab_index: int):
+    async def run_async_tasks(self, tab_index: int):
         user_input = self.appid_entry.get().strip()
         if not user_input:
             self.log.error("输入不能为空！")
             return False
-        
+
         app_id_inputs = [item.strip() for item in user_input.split(',')]
-        
+        client = await self.backend.get_client()
+
         try:
             if tab_index == 0:
                 repo_name, repo_val = self.repo_options[self.repo_combobox.current()]
@@ -730,6 +703,12 @@ class CaiInstallGUI:
             if messagebox.askyesno("退出", "正在处理任务，确定要强制退出吗？"):
                 os._exit(0)
         else:
+            # 关闭共享HTTP客户端并停掉后台事件循环
+            try:
+                self.async_runner.run(self.backend.close_client())
+            except Exception:
+                pass
+            self.async_runner.shutdown()
             self.root.destroy()
 
     def show_about_dialog(self):
@@ -825,11 +804,17 @@ class CaiInstallGUI:
         button_frame.grid(row=5, column=0, columnspan=2, pady=(10, 0))
         
         def save_and_close():
+            old_steam_path = self.backend.app_config.get("Custom_Steam_Path", "")
             self.backend.app_config["Github_Personal_Token"] = token_entry.get().strip()
             self.backend.app_config["Custom_Steam_Path"] = path_entry.get().strip()
             self.backend.app_config["steamtools_only_lua"] = st_lua_only_var.get()
             self.backend.app_config["auto_restart_steam"] = auto_restart_var.get()
             self.backend.save_config()
+            # Steam路径变更后让检测缓存失效并重新探测
+            if self.backend.app_config["Custom_Steam_Path"] != old_steam_path:
+                self.backend.invalidate_detection()
+                self.backend.detect_steam_path()
+                self.backend.detect_unlocker()
             self.log.info("配置已保存。")
             if self.backend.app_config.get("steamtools_only_lua"):
                 self.log.info("已启用 [SteamTools自动更新] 模式。")
@@ -845,26 +830,26 @@ class CaiInstallGUI:
         """验证 GitHub Token"""
         def validate_async():
             async def validate():
-                async with httpx.AsyncClient() as client:
-                    headers = {'Authorization': f'token {token}'} if token else {}
-                    try:
-                        r = await client.get('https://api.github.com/rate_limit', headers=headers)
-                        if r.status_code == 200:
-                            data = r.json()
-                            limit = data['resources']['core']['limit']
-                            remaining = data['resources']['core']['remaining']
-                            self.root.after(0, lambda: messagebox.showinfo("验证成功", 
-                                f"GitHub Token 有效！\n\nAPI 限制: {limit}\n剩余次数: {remaining}"))
-                        elif r.status_code == 401:
-                            self.root.after(0, lambda: messagebox.showerror("验证失败", 
-                                "GitHub Token 无效或已过期"))
-                        else:
-                            self.root.after(0, lambda: messagebox.showerror("验证失败", 
-                                f"HTTP {r.status_code}: {r.text[:100]}"))
-                    except Exception as e:
-                        self.root.after(0, lambda: messagebox.showerror("验证失败", f"错误: {e}"))
-            
-            asyncio.run(validate())
+                client = await self.backend.get_client()
+                headers = {'Authorization': f'token {token}'} if token else {}
+                try:
+                    r = await client.get('https://api.github.com/rate_limit', headers=headers)
+                    if r.status_code == 200:
+                        data = r.json()
+                        limit = data['resources']['core']['limit']
+                        remaining = data['resources']['core']['remaining']
+                        self.root.after(0, lambda: messagebox.showinfo("验证成功",
+                            f"GitHub Token 有效！\n\nAPI 限制: {limit}\n剩余次数: {remaining}"))
+                    elif r.status_code == 401:
+                        self.root.after(0, lambda: messagebox.showerror("验证失败",
+                            "GitHub Token 无效或已过期"))
+                    else:
+                        self.root.after(0, lambda: messagebox.showerror("验证失败",
+                            f"HTTP {r.status_code}: {r.text[:100]}"))
+                except Exception as e:
+                    self.root.after(0, lambda: messagebox.showerror("验证失败", f"错误: {e}"))
+
+            self.async_runner.run(validate())
         
         threading.Thread(target=validate_async, daemon=True).start()
 
@@ -945,14 +930,11 @@ class CaiInstallGUI:
 
     def background_check_update(self):
         """后台检查更新"""
-        async def check():
-            await self._check_update_async(show_no_update=False)
-        
-        asyncio.run(check())
+        self.async_runner.run(self._check_update_async(show_no_update=False))
 
     def check_for_updates(self):
         """手动检查更新"""
-        threading.Thread(target=lambda: asyncio.run(self._check_update_async(show_no_update=True)), daemon=True).start()
+        threading.Thread(target=lambda: self.async_runner.run(self._check_update_async(show_no_update=True)), daemon=True).start()
     
     async def _check_update_async(self, show_no_update: bool):
         """异步检查更新"""
@@ -1156,19 +1138,16 @@ class CaiInstallGUI:
         # 在新线程中执行下载
         def download_and_update():
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
                 try:
                     self.root.after(0, lambda: status_label.config(
                         text=f"开始下载更新文件 ({network_status})...\n请稍候..."
                     ))
-                    
+
                     # 下载更新文件
-                    update_exe_path = loop.run_until_complete(
+                    update_exe_path = self.async_runner.run(
                         self.update_manager.download_update(download_url, update_progress)
                     )
-                    
+
                     if update_exe_path and os.path.exists(update_exe_path):
                         self.root.after(0, lambda: self.update_path_label.config(
                             text=f"文件位置: {os.path.basename(update_exe_path)}"
@@ -1204,9 +1183,7 @@ class CaiInstallGUI:
                         parent=self.root
                     ))
                     self.root.after(0, progress_dialog.destroy)
-                finally:
-                    loop.close()
-                    
+
             except Exception as e:
                 self.log.error(f"更新过程出错: {str(e)}")
                 self.root.after(0, lambda: messagebox.showerror(